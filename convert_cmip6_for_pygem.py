@@ -6,10 +6,57 @@ This script takes the real ACCESS-CM2 CMIP6 data you downloaded and converts it
 to the exact format PyGEM expects, replacing the artificial climate data.
 """
 
+import importlib.util
 import xarray as xr
 import numpy as np
 from pathlib import Path
-import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+# Stream the cubes through dask in time chunks and use h5netcdf for I/O when available
+TIME_CHUNKS = {'time': 120} if importlib.util.find_spec('dask') else None
+NC_ENGINE = 'h5netcdf' if importlib.util.find_spec('h5netcdf') and importlib.util.find_spec('h5py') else None
+
+# CMIP6 bookkeeping variables that PyGEM never reads
+UNUSED_VARS = ('time_bnds', 'lat_bnds', 'lon_bnds', 'height')
+
+def open_climate_dataset(path):
+    """Open a CMIP6 NetCDF file lazily"""
+    return xr.open_dataset(path, chunks=TIME_CHUNKS, engine=NC_ENGINE)
+
+def wrap_longitude(ds):
+    """Shift a regular global 0-360 longitude grid to -180-180
+    
+    The rewrap is a pure cyclic shift, so roll the data instead of sorting it.
+    Assumes an ascending, globally regular longitude axis.
+    """
+    lon_wrapped = ((ds.lon.values + 180) % 360) - 180
+    shift = (len(lon_wrapped) - int(np.argmin(lon_wrapped))) % len(lon_wrapped)
+    ds = ds.roll(lon=shift, roll_coords=True)
+    return ds.assign_coords(lon=np.roll(lon_wrapped, shift))
+
+def compute_together(*objs):
+    """Evaluate lazy xarray objects in one shared dask pass (no-op when eager)"""
+    if TIME_CHUNKS is None:
+        return objs
+    import dask
+    return dask.compute(*objs)
+
+# Source encoding entries that describe on-disk packing; to_netcdf's encoding= replaces them otherwise
+PACKING_KEYS = ('dtype', 'scale_factor', 'add_offset', '_FillValue', 'missing_value')
+
+def compressed_encoding(ds, var, dtype='float32'):
+    """Deflate-compressed, time-chunked NetCDF encoding for a single variable
+    
+    dtype=None keeps the variable's source dtype and packing (e.g. int16 with scale_factor/add_offset).
+    """
+    da = ds[var]
+    chunksizes = tuple(min(n, 120) if dim == 'time' else n for dim, n in zip(da.dims, da.shape))
+    encoding = {'zlib': True, 'complevel': 3, 'chunksizes': chunksizes}
+    if dtype is None:
+        encoding.update({k: v for k, v in da.encoding.items() if k in PACKING_KEYS})
+    else:
+        encoding['dtype'] = dtype
+    return {var: encoding}
 
 def convert_cmip6_for_pygem():
     """Convert CMIP6 data to PyGEM format"""
@@ -25,36 +72,34 @@ def convert_cmip6_for_pygem():
     output_dir = Path("/Users/kaimyers/PygemRound2/data/climate_data/cmip6/ACCESS-CM2")
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Load the data
+    # Load the data; both header reads are disk-bound, so overlap them
     print("📡 Loading CMIP6 temperature data...")
-    temp_ds = xr.open_dataset(temp_file)
-    
     print("🌧️  Loading CMIP6 precipitation data...")
-    precip_ds = xr.open_dataset(precip_file)
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        temp_ds, precip_ds = ex.map(open_climate_dataset, [temp_file, precip_file])
     
     # Convert coordinate names to PyGEM format
     print("🔧 Converting to PyGEM coordinate format...")
     
     # For CMIP6 models, PyGEM expects 'lat' and 'lon' (not 'latitude' and 'longitude')
     # Keep original names since ACCESS-CM2 already uses 'lat' and 'lon'
-    temp_pygem = temp_ds.copy()
-    precip_pygem = precip_ds.copy()
     
-    # Convert longitude from 0-360 to -180-180 format (PyGEM prefers this)
+    # Convert longitude from 0-360 to -180-180 format (PyGEM prefers this);
+    # xarray returns new objects, so the source datasets need no defensive copy
     print("🌍 Converting longitude coordinates...")
-    temp_pygem = temp_pygem.assign_coords(lon=((temp_pygem.lon + 180) % 360) - 180)
-    temp_pygem = temp_pygem.sortby('lon')
+    temp_pygem = wrap_longitude(temp_ds)
+    precip_pygem = wrap_longitude(precip_ds)
     
-    precip_pygem = precip_pygem.assign_coords(lon=((precip_pygem.lon + 180) % 360) - 180)
-    precip_pygem = precip_pygem.sortby('lon')
-    
-    # Check data quality
+    # Check data quality and warming trend; reductions share a single read of each cube
     print("🔍 Checking data quality...")
-    temp_data = temp_pygem.tas.values
-    precip_data = precip_pygem.pr.values
+    temp_nan, precip_nan, annual_temp_series = compute_together(
+        temp_pygem.tas.isnull().sum(),
+        precip_pygem.pr.isnull().sum(),
+        temp_pygem.tas.groupby('time.year').mean()
+    )
     
-    temp_nan_pct = (np.isnan(temp_data).sum() / temp_data.size) * 100
-    precip_nan_pct = (np.isnan(precip_data).sum() / precip_data.size) * 100
+    temp_nan_pct = (int(temp_nan) / temp_pygem.tas.size) * 100
+    precip_nan_pct = (int(precip_nan) / precip_pygem.pr.size) * 100
     
     print(f"   Temperature NaN values: {temp_nan_pct:.1f}%")
     print(f"   Precipitation NaN values: {precip_nan_pct:.1f}%")
@@ -66,8 +111,6 @@ def convert_cmip6_for_pygem():
     
     # Check for warming trends (this should show progressive warming unlike artificial data)
     print("🌡️  Checking for climate warming trends...")
-    annual_temp_series = temp_pygem.tas.groupby('time.year').mean()
-    
     temp_2015_2025 = annual_temp_series.sel(year=slice(2015, 2025)).mean().values
     temp_2090_2100 = annual_temp_series.sel(year=slice(2090, 2100)).mean().values
     warming_trend = temp_2090_2100 - temp_2015_2025
@@ -87,12 +130,12 @@ def convert_cmip6_for_pygem():
     
     print(f"💾 Saving temperature data to: {output_temp}")
     # Keep only essential variables for PyGEM
-    temp_clean = temp_pygem[['tas']].copy()
-    temp_clean.to_netcdf(output_temp)
+    temp_clean = temp_pygem[['tas']].drop_vars(UNUSED_VARS, errors='ignore')
+    temp_clean.to_netcdf(output_temp, encoding=compressed_encoding(temp_clean, 'tas'), engine=NC_ENGINE)
     
     print(f"💾 Saving precipitation data to: {output_precip}")
-    precip_clean = precip_pygem[['pr']].copy()
-    precip_clean.to_netcdf(output_precip)
+    precip_clean = precip_pygem[['pr']].drop_vars(UNUSED_VARS, errors='ignore')
+    precip_clean.to_netcdf(output_precip, encoding=compressed_encoding(precip_clean, 'pr'), engine=NC_ENGINE)
     
     # Create orography file (copy from ERA5 since topography doesn't change)
     era5_orog = "/Users/kaimyers/PygemRound2/data/climate_data/ERA5_real_extended/ERA5_geopotential.nc"
@@ -105,7 +148,7 @@ def convert_cmip6_for_pygem():
             # ERA5 uses 'latitude'/'longitude', need to rename to 'lat'/'lon' for CMIP6 consistency
             orog_pygem = orog_ds.rename({'latitude': 'lat', 'longitude': 'lon'})
             orog_clean = orog_pygem[['z']].rename({'z': 'orog'})
-            orog_clean.to_netcdf(output_orog)
+            orog_clean.to_netcdf(output_orog, encoding=compressed_encoding(orog_clean, 'orog', dtype=None), engine=NC_ENGINE)
             orog_ds.close()
             print("   ✅ Orography file created")
         except Exception as e:
@@ -19,24 +19,97 @@ Key fixes implemented:
 
 import os
 import sys
+import argparse
 import yaml
-import pandas as pd
 import numpy as np
 import subprocess
 import time
 import json
-import shutil
 import tempfile
 import hashlib
+import contextlib
 from pathlib import Path
 from datetime import datetime
+from types import MappingProxyType
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import logging
+from sweep_utils import dumps, default_workers, read_tail, link_or_copy, list_run_outputs, write_csv
+
+# libyaml-backed C loader/dumper when available, pure-Python fallback otherwise
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+try:
+    import fcntl
+except ImportError:  # Windows: no POSIX advisory locks, run unlocked
+    fcntl = None
+
+# h5netcdf opens outputs without netCDF4's CF mask/scale decoding
+# (h5netcdf only lists h5py as an extra, so require both for a working backend)
+try:
+    import h5py
+    import h5netcdf
+except ImportError:
+    h5netcdf = None
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+def _init_worker_logging(log_file):
+    """Route worker-process log records to the sweep log"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format=LOG_FORMAT,
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler()
+        ]
+    )
+
+def _open_netcdf(path):
+    """Open a NetCDF file read-only with h5netcdf, or netCDF4 when it is unavailable"""
+    if h5netcdf is not None:
+        return h5netcdf.File(path, 'r')
+    import netCDF4 as nc
+    ds = nc.Dataset(path, 'r')
+    ds.set_auto_maskandscale(False)
+    return ds
+
+def _deep_merge(base, overlay):
+    """Merge overlay into base, copying only the dicts along the overlay's paths
+    
+    Untouched subtrees are shared with base, so base must not be mutated.
+    """
+    merged = dict(base)
+    for key, value in overlay.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), Mapping):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+@contextlib.contextmanager
+def _locked(path, mode):
+    """Open a file under a shared (read) or exclusive (write) advisory lock"""
+    with open(path, mode) as f:
+        if fcntl is None:
+            yield f
+            return
+        fcntl.flock(f, fcntl.LOCK_SH if 'r' in mode else fcntl.LOCK_EX)
+        try:
+            yield f
+        finally:
+            f.flush()
+            fcntl.flock(f, fcntl.LOCK_UN)
 
 class RobustParameterTest:
     """Robust parameter sweep test with comprehensive bug fixes"""
     
-    def __init__(self, base_dir="/Users/kaimyers/PygemRound2"):
+    def __init__(self, base_dir="/Users/kaimyers/PygemRound2", workers=None, output_dir_flag=None):
         self.base_dir = Path(base_dir)
+        self.workers = workers or default_workers()
         self.pygem_dir = self.base_dir / "PyGEM"
         self.test_dir = self.base_dir / "parameter_test_robust"
         self.results_dir = self.test_dir / "results"
@@ -45,6 +118,7 @@ class RobustParameterTest:
         # Critical file paths
         self.base_config_path = self.pygem_dir / "pygem" / "setup" / "config.yaml"
         self.simulation_script = self.pygem_dir / "pygem" / "bin" / "run" / "run_simulation.py"
+        self._base_config = None
         
         # Create directories
         for directory in [self.test_dir, self.results_dir, self.configs_dir]:
@@ -56,20 +130,28 @@ class RobustParameterTest:
         # Validate setup
         self.validate_setup()
         
+        # run_simulation.py option for writing outputs straight into each run directory, if one is given
+        self.output_dir_flag = output_dir_flag
+        if self.output_dir_flag:
+            self.logger.info("PyGEM outputs go directly to run directories via %s", self.output_dir_flag)
+        else:
+            self.logger.info("Outputs will be linked into run directories")
+        
     def setup_logging(self):
         """Setup comprehensive logging"""
         log_file = self.test_dir / f"test_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        self.log_file = log_file
         
         logging.basicConfig(
             level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
+            format=LOG_FORMAT,
             handlers=[
                 logging.FileHandler(log_file),
                 logging.StreamHandler()
             ]
         )
         self.logger = logging.getLogger(__name__)
-        self.logger.info(f"Logging initialized: {log_file}")
+        self.logger.info("Logging initialized: %s", log_file)
     
     def validate_setup(self):
         """Validate all required files and directories exist"""
@@ -84,15 +166,22 @@ class RobustParameterTest:
                 self.logger.error(error_msg)
                 raise FileNotFoundError(error_msg)
         
-        # Validate config file is readable
+        # Validate config file is readable; the parsed config is kept, so run_test reuses it
         try:
-            with open(self.base_config_path, 'r') as f:
-                yaml.safe_load(f)
+            self.load_base_config()
             self.logger.info("Setup validation passed")
         except Exception as e:
-            self.logger.error(f"Config file validation failed: {e}")
+            self.logger.error("Config file validation failed: %s", e)
             raise
     
+    def load_base_config(self):
+        """Parse the base config on first use and return a read-only view of it"""
+        if self._base_config is None:
+            with _locked(self.base_config_path, 'r') as f:
+                self._base_config = yaml.load(f, Loader=_Loader)
+            self.logger.info("YAML backend: %s", _Loader.__name__)
+        return MappingProxyType(self._base_config)
+    
     def create_realistic_parameter_grid(self):
         """Create realistic 3x3 parameter grid for testing"""
         # Literature-based realistic ranges for Dixon Glacier
@@ -108,98 +197,93 @@ class RobustParameterTest:
             'precgrad': 0.0002     # Moderate precipitation gradient
         }
         
-        # Generate all combinations (3x3x3 = 27 total, but we'll limit to 9 for testing)
-        import itertools
-        combinations = list(itertools.product(*param_ranges.values()))
+        # Generate all combinations (3x3x3 = 27 total, but we'll limit to 9 for testing),
+        # in the same tbias-major order as itertools.product
+        grid = np.stack(np.meshgrid(*param_ranges.values(), indexing='ij'), axis=-1).reshape(-1, len(param_ranges))
         
         # Select 9 representative combinations
-        selected_indices = [0, 4, 8, 9, 13, 17, 18, 22, 26]  # Spread across parameter space
-        selected_combinations = [combinations[i] for i in selected_indices if i < len(combinations)]
+        selected_indices = np.array([0, 4, 8, 9, 13, 17, 18, 22, 26])  # Spread across parameter space
+        selected_combinations = grid[selected_indices[selected_indices < len(grid)]]
         
-        parameter_sets = []
-        for i, combo in enumerate(selected_combinations):
-            param_set = {
+        parameter_sets = [
+            {
                 'run_id': i,
-                'tbias': combo[0],
-                'kp': combo[1], 
-                'ddfsnow': combo[2],
+                'tbias': tbias,
+                'kp': kp,
+                'ddfsnow': ddfsnow,
                 'lapserate': fixed_params['lapserate'],
                 'precgrad': fixed_params['precgrad']
             }
-            parameter_sets.append(param_set)
+            for i, (tbias, kp, ddfsnow) in enumerate(selected_combinations.tolist())
+        ]
         
-        self.logger.info(f"Created {len(parameter_sets)} realistic parameter combinations")
+        self.logger.info("Created %d realistic parameter combinations", len(parameter_sets))
         return parameter_sets
     
     def create_atomic_config(self, params):
         """Create config file with atomic operations to prevent corruption"""
-        run_id = params['run_id']
-        
-        # Load base config with error handling
-        try:
-            with open(self.base_config_path, 'r') as f:
-                config = yaml.safe_load(f)
-        except Exception as e:
-            self.logger.error(f"Failed to load base config: {e}")
-            raise
-        
-        # Update parameters
-        if 'sim' not in config:
-            config['sim'] = {}
-        if 'params' not in config['sim']:
-            config['sim']['params'] = {}
-        
-        # Set simulation parameters
-        for param, value in params.items():
-            if param != 'run_id':
-                config['sim']['params'][param] = float(value)
-        
-        # Set simulation settings
-        config['sim']['sim_startyear'] = 2015
-        config['sim']['sim_endyear'] = 2100
-        config['sim']['export_extra_vars'] = True
-        config['sim']['export_binned_data'] = True
-        
-        # Set Dixon Glacier specific settings
-        config['setup']['glac_no'] = [1.20947]
-        config['setup']['rgi_region01'] = [1]
-        
-        # Use ssp245 scenario
-        config['climate']['sim_climate_scenario'] = 'ssp245'
+        rid = f"{params['run_id']:03d}"
+        
+        # Overlay only the per-run settings onto the shared, read-only base config
+        overlay = {
+            'sim': {
+                # Set simulation parameters
+                'params': {param: float(value) for param, value in params.items() if param != 'run_id'},
+                # Set simulation settings
+                'sim_startyear': 2015,
+                'sim_endyear': 2100,
+                'export_extra_vars': True,
+                'export_binned_data': True
+            },
+            # Set Dixon Glacier specific settings
+            'setup': {
+                'glac_no': [1.20947],
+                'rgi_region01': [1]
+            },
+            # Use ssp245 scenario
+            'climate': {
+                'sim_climate_scenario': 'ssp245'
+            }
+        }
+        config = _deep_merge(self.load_base_config(), overlay)
         
         # Create unique config file for this run
-        config_file = self.configs_dir / f"config_run_{run_id:03d}.yaml"
+        config_file = self.configs_dir / f"config_run_{rid}.yaml"
         
         # Atomic write operation
         temp_file = config_file.with_suffix('.yaml.tmp')
         try:
-            with open(temp_file, 'w') as f:
-                yaml.dump(config, f, default_flow_style=False, sort_keys=False)
-            
-            # Verify written file
-            with open(temp_file, 'r') as f:
-                test_load = yaml.safe_load(f)
+            with _locked(temp_file, 'w') as f:
+                yaml.dump(config, f, Dumper=_Dumper, default_flow_style=False, sort_keys=False)
+                # Make the contents durable before the rename, so a crash cannot
+                # leave a truncated config in place
+                f.flush()
+                os.fsync(f.fileno())
             
             # Atomic move
-            temp_file.replace(config_file)
+            os.replace(temp_file, config_file)
             
-            self.logger.debug(f"Created config for run {run_id:03d}: {config_file}")
+            self.logger.debug("Created config for run %s: %s", rid, config_file)
             return config_file
             
         except Exception as e:
             if temp_file.exists():
                 temp_file.unlink()
-            self.logger.error(f"Failed to create config for run {run_id:03d}: {e}")
+            self.logger.error("Failed to create config for run %s: %s", rid, e)
             raise
     
-    def run_single_simulation(self, params):
-        """Run single simulation with complete isolation and error handling"""
+    def prepare_run(self, params):
+        """Create the run directory, config file and command line for one run
+        
+        Returns (run_state, run_dir, cmd); cmd is None if setup failed.
+        """
         run_id = params['run_id']
+        rid = f"{run_id:03d}"
         
-        self.logger.info(f"Starting run {run_id:03d}: {params}")
+        self.logger.info("Starting run %s: %s", rid, params)
         
         # Create run directory
-        run_dir = self.results_dir / f"run_{run_id:03d}"
+        run_dir = self.results_dir / f"run_{rid}"
         run_dir.mkdir(exist_ok=True)
         
         # Initialize run state
@@ -207,7 +291,7 @@ class RobustParameterTest:
             'run_id': run_id,
             'status': 'started',
             'parameters': params,
-            'start_time': datetime.now().isoformat()
+            'start_time': None  # stamped at launch, which the pipelined path defers
         }
         
         try:
@@ -216,9 +300,7 @@ class RobustParameterTest:
             run_state['config_file'] = str(config_file)
             
             # Create unique output suffix
-            output_suffix = f"_test{run_id:03d}"
-            
-            start_time = time.time()
+            output_suffix = f"_test{rid}"
             
             # Build command with explicit parameters
             cmd = [
@@ -234,109 +316,230 @@ class RobustParameterTest:
                 '-export_binned_data',
                 '-outputfn_sfix', output_suffix
             ]
-            
-            self.logger.info(f"Executing: {' '.join(cmd)}")
-            
-            # Execute simulation with timeout
-            result = subprocess.run(
-                cmd,
-                cwd=self.base_dir,
-                capture_output=True,
-                text=True,
-                timeout=1800  # 30 minute timeout
-            )
+            if self.output_dir_flag:
+                cmd += [self.output_dir_flag, str(run_dir)]
+        
+        except Exception as e:
+            run_state['status'] = 'error'
+            run_state['error'] = str(e)
+            self.logger.error("💥 Run %s error: %s", rid, e)
+            return run_state, run_dir, None
+        
+        return run_state, run_dir, cmd
+    
+    def launch_run(self, cmd, run_dir):
+        """Start a simulation without waiting, streaming stdout/stderr straight to the run logs"""
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Executing: %s", ' '.join(cmd))
+        
+        with open(run_dir / 'stdout.log', 'wb') as out, open(run_dir / 'stderr.log', 'wb') as err:
+            return subprocess.Popen(cmd, cwd=self.base_dir, stdout=out, stderr=err)
+    
+    def complete_run(self, run_state, run_dir, proc, start_time):
+        """Wait for a launched simulation, collect its outputs and save its run state"""
+        run_id = run_state['run_id']
+        rid = f"{run_id:03d}"
+        
+        try:
+            try:
+                returncode = proc.wait(timeout=max(0, 1800 - (time.time() - start_time)))  # 30 minute timeout
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+                raise
             
             runtime = time.time() - start_time
             
-            # Save stdout/stderr
-            with open(run_dir / 'stdout.log', 'w') as f:
-                f.write(result.stdout)
-            with open(run_dir / 'stderr.log', 'w') as f:
-                f.write(result.stderr)
-            
             # Check results
-            if result.returncode == 0:
+            if returncode == 0:
                 run_state['status'] = 'completed'
                 run_state['runtime'] = runtime
                 
-                # Copy output files
-                self.copy_output_files(run_id, output_suffix, run_dir)
+                # Collect output files unless PyGEM already wrote them into run_dir
+                if not self.output_dir_flag:
+                    self.copy_output_files(run_id, f"_test{rid}", run_dir)
                 
-                # Validate output files
-                self.validate_output_files(run_dir, run_state)
+                # Record the stats file; contents are validated for all runs at once after the sweep
+                self.record_stats_path(run_dir, run_state)
                 
-                self.logger.info(f"✅ Run {run_id:03d} completed successfully in {runtime:.1f}s")
+                self.logger.info("✅ Run %s completed successfully in %.1fs", rid, runtime)
                 
             else:
                 run_state['status'] = 'failed'
                 run_state['runtime'] = runtime
-                run_state['returncode'] = result.returncode
-                run_state['stderr'] = result.stderr[-1000:]  # Last 1000 chars
+                run_state['returncode'] = returncode
+                run_state['stderr'] = read_tail(run_dir / 'stderr.log', 1000)  # Last 1000 bytes
                 
-                self.logger.error(f"❌ Run {run_id:03d} failed (code {result.returncode}) after {runtime:.1f}s")
-                self.logger.error(f"Error: {result.stderr[-500:]}")
+                self.logger.error("❌ Run %s failed (code %s) after %.1fs", rid, returncode, runtime)
+                self.logger.error("Error: %s", run_state['stderr'][-500:])
         
         except subprocess.TimeoutExpired:
             run_state['status'] = 'timeout'
             run_state['runtime'] = 1800
-            self.logger.error(f"⏰ Run {run_id:03d} timed out after 30 minutes")
+            self.logger.error("⏰ Run %s timed out after 30 minutes", rid)
         
         except Exception as e:
             run_state['status'] = 'error'
             run_state['error'] = str(e)
-            self.logger.error(f"💥 Run {run_id:03d} error: {e}")
+            self.logger.error("💥 Run %s error: %s", rid, e)
         
-        # Save run state
+        return self.save_run_state(run_state, run_dir)
+    
+    def save_run_state(self, run_state, run_dir):
+        """Stamp the end time and write run_state.json"""
         run_state['end_time'] = datetime.now().isoformat()
-        with open(run_dir / 'run_state.json', 'w') as f:
-            json.dump(run_state, f, indent=2, default=str)
-        
+        (run_dir / 'run_state.json').write_bytes(dumps(run_state))
         return run_state
     
+    def start_run(self, job):
+        """Launch a prepared run; returns (proc, start_time), or None after recording a launch error"""
+        run_state, run_dir, cmd = job
+        run_state['start_time'] = datetime.now().isoformat()
+        if cmd is None:
+            return None
+        start_time = time.time()
+        try:
+            return self.launch_run(cmd, run_dir), start_time
+        except Exception as e:
+            run_state['status'] = 'error'
+            run_state['error'] = str(e)
+            self.logger.error("💥 Run %03d error: %s", run_state['run_id'], e)
+            return None
+    
+    def run_single_simulation(self, params):
+        """Run single simulation with complete isolation and error handling"""
+        job = self.prepare_run(params)
+        run_state, run_dir, _ = job
+        
+        started = self.start_run(job)
+        if started is None:
+            return self.save_run_state(run_state, run_dir)
+        return self.complete_run(run_state, run_dir, *started)
+    
+    def record_worker_failure(self, params, error):
+        """Build and save an 'error' run state for a run whose worker failed"""
+        run_id = params['run_id']
+        self.logger.error("💥 Run %03d worker failed: %s", run_id, error)
+        
+        run_dir = self.results_dir / f"run_{run_id:03d}"
+        run_dir.mkdir(exist_ok=True)
+        run_state = {
+            'run_id': run_id,
+            'status': 'error',
+            'parameters': params,
+            'start_time': None,
+            'error': f"worker failed: {error}"
+        }
+        return self.save_run_state(run_state, run_dir)
+    
+    def run_pipelined(self, parameter_sets):
+        """Run simulations one at a time, preparing run N+1 while run N executes
+        
+        Config writes, directory setup and logging for the next run overlap the
+        current simulation instead of adding to the serial wall time.
+        """
+        results = []
+        job = self.prepare_run(parameter_sets[0]) if parameter_sets else None
+        
+        for i in range(len(parameter_sets)):
+            run_state, run_dir, _ = job
+            started = self.start_run(job)
+            
+            # Set up the next run while this one is in flight
+            job = self.prepare_run(parameter_sets[i + 1]) if i + 1 < len(parameter_sets) else None
+            
+            if started is None:
+                results.append(self.save_run_state(run_state, run_dir))
+            else:
+                results.append(self.complete_run(run_state, run_dir, *started))
+        
+        return results
+    
     def copy_output_files(self, run_id, output_suffix, run_dir):
-        """Copy PyGEM output files to results directory"""
+        """Hardlink PyGEM output files into the run directory (copying across filesystems)"""
         # Standard PyGEM output location
         output_base = self.base_dir / "data" / "Output" / "simulations" / "01" / "ACCESS-CM2" / "ssp245"
         
-        files_copied = 0
-        
-        # Copy stats files
-        stats_dir = output_base / "stats"
-        if stats_dir.exists():
-            for nc_file in stats_dir.glob(f"*{output_suffix}*.nc"):
-                dest_file = run_dir / nc_file.name
-                shutil.copy2(nc_file, dest_file)
-                files_copied += 1
-        
-        # Copy binned files
-        binned_dir = output_base / "binned"
-        if binned_dir.exists():
-            for nc_file in binned_dir.glob(f"*{output_suffix}*.nc"):
-                dest_file = run_dir / nc_file.name
-                shutil.copy2(nc_file, dest_file)
-                files_copied += 1
-        
-        self.logger.info(f"Copied {files_copied} output files for run {run_id:03d}")
+        files_linked = 0
+        
+        # Link stats and binned files
+        for subdir in ("stats", "binned"):
+            for src in list_run_outputs(output_base / subdir, output_suffix):
+                link_or_copy(src, run_dir / src.name)
+                files_linked += 1
+        
+        self.logger.info("Linked %d output files for run %03d", files_linked, run_id)
+    
+    def record_stats_path(self, run_dir, run_state):
+        """Note the run's stats NetCDF file for batch validation"""
+        nc_files = sorted(run_dir.rglob("*.nc"))
+        
+        if not nc_files:
+            run_state['validation'] = 'no_files'
+            return
+        
+        stats_files = ([f for f in nc_files if f.name.endswith('all.nc')]
+                       or [f for f in nc_files if 'binned' not in f.name]
+                       or nc_files)
+        run_state['stats_path'] = str(stats_files[0])
+    
+    def validate_outputs_batch(self, results):
+        """Validate every recorded stats file in a single open_mfdataset pass"""
+        pending = [r for r in results if r.get('stats_path')]
+        if not pending:
+            return
+        
+        try:
+            import xarray as xr
+            import dask
+        except ImportError:
+            self.validate_outputs_individually(pending)
+            return
+        
+        try:
+            engine = 'h5netcdf' if h5netcdf is not None else None
+            with xr.open_mfdataset([r['stats_path'] for r in pending], combine='nested',
+                                   concat_dim='run', parallel=True, engine=engine) as ds:
+                area = ds['glac_area_annual'].isel(glacier=0)  # first glacier, selected by dimension name
+                final_areas, has_data = dask.compute(area.isel(year=-1).data,
+                                                     (area > 0).any(dim='year').data)
+        except Exception as e:
+            # One unreadable or differently laid-out file must not fail the whole sweep
+            self.logger.warning("Batch validation failed (%s); validating runs individually", e)
+            self.validate_outputs_individually(pending)
+            return
+        
+        for run_state, final_area, valid in zip(pending, final_areas, has_data):
+            if valid:
+                run_state['validation'] = 'valid_data'
+                run_state['final_area_km2'] = float(final_area) / 1e6
+            else:
+                run_state['validation'] = 'empty_data'
+    
+    def validate_outputs_individually(self, pending):
+        """Validate each run's output files on their own"""
+        for run_state in pending:
+            self.validate_output_files(self.results_dir / f"run_{run_state['run_id']:03d}", run_state)
     
     def validate_output_files(self, run_dir, run_state):
         """Validate that output files contain actual data"""
-        nc_files = list(run_dir.glob("*.nc"))
+        nc_files = list(run_dir.rglob("*.nc"))
         
         if not nc_files:
             run_state['validation'] = 'no_files'
             return False
         
         try:
-            import netCDF4 as nc
-            
             for nc_file in nc_files:
-                with nc.Dataset(nc_file, 'r') as ds:
+                with _open_netcdf(nc_file) as ds:
                     # Check for key variables
                     if 'glac_area_annual' in ds.variables:
-                        area_data = ds.variables['glac_area_annual'][:]
-                        if np.any(area_data > 0):
+                        # Read only the hyperslabs inspected, as plain (unmasked) arrays
+                        area_var = ds.variables['glac_area_annual']
+                        final_area = float(area_var[0, -1])
+                        if final_area > 0 or float(area_var[0, :].max()) > 0:
                             run_state['validation'] = 'valid_data'
-                            run_state['final_area_km2'] = float(area_data[0, -1] / 1e6)
+                            run_state['final_area_km2'] = final_area / 1e6
                             return True
             
             run_state['validation'] = 'empty_data'
@@ -354,18 +557,42 @@ class RobustParameterTest:
         # Create parameter grid
         parameter_sets = self.create_realistic_parameter_grid()
         
-        self.logger.info(f"Testing {len(parameter_sets)} parameter combinations:")
-        for params in parameter_sets:
-            self.logger.info(f"  Run {params['run_id']:03d}: tbias={params['tbias']}, kp={params['kp']}, ddf={params['ddfsnow']}")
+        # Parse the base config before workers receive a copy of this tester
+        self.load_base_config()
         
-        # Run simulations sequentially for testing (avoid parallelization issues)
-        results = []
+        self.logger.info("Testing %d parameter combinations:", len(parameter_sets))
         for params in parameter_sets:
-            result = self.run_single_simulation(params)
-            results.append(result)
+            self.logger.info("  Run %03d: tbias=%s, kp=%s, ddf=%s",
+                             params['run_id'], params['tbias'], params['kp'], params['ddfsnow'])
+        
+        # Runs are isolated (own config file, run_dir and output suffix), so execute them in parallel;
+        # each run writes its run_state.json as soon as it finishes
+        if self.workers > 1:
+            self.logger.info("Running with %d parallel workers", self.workers)
+            results = []
+            with ProcessPoolExecutor(max_workers=self.workers,
+                                     initializer=_init_worker_logging,
+                                     initargs=(self.log_file,)) as executor:
+                futures = {executor.submit(self.run_single_simulation, params): params
+                           for params in parameter_sets}
+                for future in as_completed(futures):
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        # A worker raised or died (BrokenProcessPool); record the run as an error and keep going
+                        results.append(self.record_worker_failure(futures[future], e))
             
-            # Brief pause between runs
-            time.sleep(2)
+            results.sort(key=lambda r: r['run_id'])
+        else:
+            self.logger.info("Running serially, preparing each run while the previous one executes")
+            results = self.run_pipelined(parameter_sets)
+        
+        # Validate all completed runs together and refresh their saved state
+        self.validate_outputs_batch(results)
+        for run_state in results:
+            if 'validation' in run_state:
+                run_dir = self.results_dir / f"run_{run_state['run_id']:03d}"
+                (run_dir / 'run_state.json').write_bytes(dumps(run_state))
         
         # Analyze results
         self.analyze_results(results)
@@ -384,11 +611,11 @@ class RobustParameterTest:
         errors = sum(1 for r in results if r['status'] == 'error')
         timeouts = sum(1 for r in results if r['status'] == 'timeout')
         
-        self.logger.info(f"Total runs: {total}")
-        self.logger.info(f"✅ Successful: {successful} ({successful/total*100:.1f}%)")
-        self.logger.info(f"❌ Failed: {failed} ({failed/total*100:.1f}%)")
-        self.logger.info(f"💥 Errors: {errors} ({errors/total*100:.1f}%)")
-        self.logger.info(f"⏰ Timeouts: {timeouts} ({timeouts/total*100:.1f}%)")
+        self.logger.info("Total runs: %d", total)
+        self.logger.info("✅ Successful: %d (%.1f%%)", successful, successful/total*100)
+        self.logger.info("❌ Failed: %d (%.1f%%)", failed, failed/total*100)
+        self.logger.info("💥 Errors: %d (%.1f%%)", errors, errors/total*100)
+        self.logger.info("⏰ Timeouts: %d (%.1f%%)", timeouts, timeouts/total*100)
         
         # Success analysis
         if successful > 0:
@@ -396,20 +623,19 @@ class RobustParameterTest:
             runtimes = [r['runtime'] for r in successful_runs]
             avg_runtime = np.mean(runtimes)
             
-            self.logger.info(f"\n📈 SUCCESS ANALYSIS:")
-            self.logger.info(f"Average runtime: {avg_runtime:.1f} seconds")
+            self.logger.info("\n📈 SUCCESS ANALYSIS:")
+            self.logger.info("Average runtime: %.1f seconds", avg_runtime)
             
             for run in successful_runs:
                 params = run['parameters']
                 final_area = run.get('final_area_km2', 'N/A')
-                self.logger.info(f"  Run {run['run_id']:03d}: {run['runtime']:.1f}s, final area: {final_area} km²")
+                self.logger.info("  Run %03d: %.1fs, final area: %s km²", run['run_id'], run['runtime'], final_area)
         
         # Save summary
-        summary_df = pd.DataFrame(results)
         summary_file = self.test_dir / "test_summary.csv"
-        summary_df.to_csv(summary_file, index=False)
+        write_csv(results, summary_file)
         
-        self.logger.info(f"\n💾 Results saved to: {summary_file}")
+        self.logger.info("\n💾 Results saved to: %s", summary_file)
         
         # Assessment
         if successful >= 7:  # 77%+ success rate
@@ -423,8 +649,16 @@ class RobustParameterTest:
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Robust parameter sweep test")
+    parser.add_argument('--workers', type=int, default=default_workers(),
+                        help="Number of simulations to run in parallel")
+    parser.add_argument('--pygem-output-flag', default=None,
+                        help="run_simulation.py option that sets its output directory (e.g. -output_dir); "
+                             "when given, PyGEM writes straight into each run directory")
+    args = parser.parse_args()
+    
     try:
-        tester = RobustParameterTest()
+        tester = RobustParameterTest(workers=args.workers, output_dir_flag=args.pygem_output_flag)
         results = tester.run_test()
         
         print("\n🏁 Robust Parameter Test Completed!")
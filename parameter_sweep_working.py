@@ -15,13 +15,63 @@ Fixed approach:
 
 import os
 import sys
+import argparse
+import importlib
 import subprocess
 import time
 import json
-import pandas as pd
+import traceback
 import numpy as np
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stdout, redirect_stderr
+from sweep_utils import default_workers, read_tail, link_or_copy, list_run_outputs, write_csv
+
+def _preload_pygem():
+    """Import PyGEM's run_simulation once per worker process"""
+    return importlib.import_module('pygem.bin.run.run_simulation')
+
+def _warm_worker():
+    """Pool initializer: preload PyGEM if possible
+    
+    A failed import is left for the run itself to hit and report, so it
+    cannot break the pool before any result is recorded.
+    """
+    try:
+        _preload_pygem()
+    except Exception:
+        pass
+
+def run_pygem_in_process(args, run_dir, cwd):
+    """Call run_simulation.main() in this process with the given command-line arguments
+    
+    Saves the Python + PyGEM import cost of a fresh interpreter per run. Runs from
+    cwd like the subprocess path, with stdout/stderr redirected into the run's log
+    files. Unlike the subprocess path no timeout is enforced. Returns the exit code.
+    """
+    saved_argv = sys.argv
+    saved_cwd = os.getcwd()
+    
+    with open(run_dir / 'stdout.log', 'w') as out, open(run_dir / 'stderr.log', 'w') as err:
+        with redirect_stdout(out), redirect_stderr(err):
+            try:
+                os.chdir(cwd)
+                run_simulation = _preload_pygem()
+                sys.argv = [run_simulation.__file__] + args
+                run_simulation.main()
+                returncode = 0
+            except SystemExit as e:
+                returncode = e.code if isinstance(e.code, int) else int(e.code is not None)
+            except Exception:
+                traceback.print_exc()
+                returncode = 1
+            finally:
+                sys.argv = saved_argv
+                os.chdir(saved_cwd)
+    
+    return returncode
 
 def create_realistic_parameter_grid():
     """Create 9 realistic parameter combinations spanning the parameter space"""
@@ -33,35 +83,31 @@ def create_realistic_parameter_grid():
         'ddfsnow': [0.003, 0.005, 0.007] # Degree-day factor (m°C⁻¹d⁻¹)
     }
     
-    # Generate 3x3 grid (9 combinations)
-    import itertools
-    combinations = list(itertools.product(*param_ranges.values()))
-    
-    parameter_sets = []
-    for i, combo in enumerate(combinations):
-        param_set = {
-            'run_id': i,
-            'tbias': combo[0],
-            'kp': combo[1], 
-            'ddfsnow': combo[2]
-        }
-        parameter_sets.append(param_set)
+    # Generate the full grid in the same tbias-major order as itertools.product
+    grid = np.stack(np.meshgrid(*param_ranges.values(), indexing='ij'), axis=-1).reshape(-1, len(param_ranges))
+    
+    parameter_sets = [
+        {'run_id': i, 'tbias': tbias, 'kp': kp, 'ddfsnow': ddfsnow}
+        for i, (tbias, kp, ddfsnow) in enumerate(grid.tolist())
+    ]
     
     return parameter_sets
 
-def run_single_simulation(params):
+def run_single_simulation(params, in_process=False, output_dir_flag=None):
     """Run single PyGEM simulation using the proven approach"""
     
     run_id = params['run_id']
+    rid = f"{run_id:02d}"
+    output_suffix = f"_working{rid}"
     tbias = params['tbias']
     kp = params['kp'] 
     ddfsnow = params['ddfsnow']
     
-    print(f"\n🧪 Starting run {run_id:02d}: tbias={tbias}, kp={kp}, ddf={ddfsnow}")
+    print(f"\n🧪 Starting run {rid}: tbias={tbias}, kp={kp}, ddf={ddfsnow}")
     
     # Create results directory
     results_dir = Path("/Users/kaimyers/PygemRound2/parameter_sweep_working_results")
-    run_dir = results_dir / f"run_{run_id:02d}"
+    run_dir = results_dir / f"run_{rid}"
     run_dir.mkdir(parents=True, exist_ok=True)
     
     # PyGEM simulation script
@@ -78,8 +124,10 @@ def run_single_simulation(params):
         '-sim_endyear', '2100',
         '-export_extra_vars',
         '-export_binned_data',
-        '-outputfn_sfix', f'_working{run_id:02d}'
+        '-outputfn_sfix', output_suffix
     ]
+    if output_dir_flag:
+        cmd += [output_dir_flag, str(run_dir)]
     
     print(f"Command: {' '.join(cmd)}")
     
@@ -87,39 +135,43 @@ def run_single_simulation(params):
     start_time = time.time()
     
     try:
-        result = subprocess.run(
-            cmd,
-            cwd="/Users/kaimyers/PygemRound2",
-            capture_output=True,
-            text=True,
-            timeout=1800  # 30 minute timeout for full simulation
-        )
+        if in_process:
+            returncode = run_pygem_in_process(cmd[2:], run_dir, cwd="/Users/kaimyers/PygemRound2")
+        else:
+            # Stream stdout/stderr straight to the run logs instead of buffering them
+            with open(run_dir / 'stdout.log', 'wb') as out, open(run_dir / 'stderr.log', 'wb') as err:
+                returncode = subprocess.run(
+                    cmd,
+                    cwd="/Users/kaimyers/PygemRound2",
+                    stdout=out,
+                    stderr=err,
+                    timeout=1800  # 30 minute timeout for full simulation
+                ).returncode
         
         runtime = time.time() - start_time
         
-        # Save logs
-        with open(run_dir / 'stdout.log', 'w') as f:
-            f.write(result.stdout)
-        with open(run_dir / 'stderr.log', 'w') as f:
-            f.write(result.stderr)
-        
         # Check results
-        if result.returncode == 0:
-            print(f"✅ Run {run_id:02d} SUCCESS in {runtime:.1f}s")
+        if returncode == 0:
+            print(f"✅ Run {rid} SUCCESS in {runtime:.1f}s")
             
             # Check for output files
-            output_base = Path("/Users/kaimyers/PygemRound2/data/Output/simulations/01/ACCESS-CM2/ssp245")
-            
-            stats_files = list((output_base / "stats").glob(f"*_working{run_id:02d}*.nc")) if (output_base / "stats").exists() else []
-            binned_files = list((output_base / "binned").glob(f"*_working{run_id:02d}*.nc")) if (output_base / "binned").exists() else []
+            if output_dir_flag:
+                # PyGEM wrote straight into run_dir; nothing to collect
+                nc_files = list(run_dir.rglob("*.nc"))
+                binned_files = [f for f in nc_files if 'binned' in f.parent.name or 'binned' in f.name]
+                stats_files = [f for f in nc_files if f not in binned_files]
+            else:
+                output_base = Path("/Users/kaimyers/PygemRound2/data/Output/simulations/01/ACCESS-CM2/ssp245")
+                
+                stats_files = list_run_outputs(output_base / "stats", output_suffix)
+                binned_files = list_run_outputs(output_base / "binned", output_suffix)
+                
+                # Copy files to results
+                for nc_file in stats_files + binned_files:
+                    link_or_copy(nc_file, run_dir / nc_file.name)
             
             print(f"   📄 Output files: {len(stats_files)} stats, {len(binned_files)} binned")
             
-            # Copy files to results
-            import shutil
-            for nc_file in stats_files + binned_files:
-                shutil.copy2(nc_file, run_dir / nc_file.name)
-            
             # Validate file contents and extract key metrics
             final_area = None
             initial_area = None
@@ -157,20 +209,21 @@ def run_single_simulation(params):
             }
         
         else:
-            print(f"❌ Run {run_id:02d} FAILED (code {result.returncode}) after {runtime:.1f}s")
-            print(f"   Error: {result.stderr[-200:]}")
+            stderr_tail = read_tail(run_dir / 'stderr.log', 500)
+            print(f"❌ Run {rid} FAILED (code {returncode}) after {runtime:.1f}s")
+            print(f"   Error: {stderr_tail[-200:]}")
             
             return {
                 'run_id': run_id,
                 'status': 'failed',
                 'runtime': runtime,
                 'parameters': params,
-                'returncode': result.returncode,
-                'error': result.stderr[-500:]
+                'returncode': returncode,
+                'error': stderr_tail
             }
     
     except subprocess.TimeoutExpired:
-        print(f"⏰ Run {run_id:02d} TIMEOUT after 30 minutes")
+        print(f"⏰ Run {rid} TIMEOUT after 30 minutes")
         return {
             'run_id': run_id,
             'status': 'timeout',
@@ -179,7 +232,7 @@ def run_single_simulation(params):
         }
     
     except Exception as e:
-        print(f"💥 Run {run_id:02d} ERROR: {e}")
+        print(f"💥 Run {rid} ERROR: {e}")
         return {
             'run_id': run_id,
             'status': 'error',
@@ -188,8 +241,9 @@ def run_single_simulation(params):
             'error': str(e)
         }
 
-def main():
+def main(workers=None, in_process=False, output_dir_flag=None):
     """Run working parameter sweep with 9 realistic combinations"""
+    workers = workers or default_workers()
     print("🚀 WORKING PARAMETER SWEEP - 9 Realistic Combinations")
     print("=" * 60)
     print("Using proven approach from simple test (100% success rate)")
@@ -201,21 +255,40 @@ def main():
     for params in parameter_sets:
         print(f"  Run {params['run_id']:02d}: tbias={params['tbias']}, kp={params['kp']}, ddf={params['ddfsnow']}")
     
-    # Run simulations sequentially for reliability
+    # Run simulations in parallel; each run has its own run_dir and output suffix
+    print(f"\n⚙️ Running with {workers} parallel workers")
     results = []
     start_time = time.time()
+    results_dir = Path("/Users/kaimyers/PygemRound2/parameter_sweep_working_results")
     
-    for params in parameter_sets:
-        result = run_single_simulation(params)
-        results.append(result)
-        
-        # Save individual result
-        results_dir = Path("/Users/kaimyers/PygemRound2/parameter_sweep_working_results")
-        with open(results_dir / f"run_{params['run_id']:02d}_result.json", 'w') as f:
-            json.dump(result, f, indent=2, default=str)
-        
-        # Brief pause between runs
-        time.sleep(5)
+    # In-process runs import PyGEM once per worker instead of once per simulation
+    initializer = _warm_worker if in_process else None
+    if output_dir_flag:
+        print(f"📂 PyGEM outputs go directly to run directories via {output_dir_flag}")
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer) as executor:
+        futures = {executor.submit(run_single_simulation, params, in_process, output_dir_flag): params
+                   for params in parameter_sets}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                # A worker died (e.g. crashed inside PyGEM); record the run as failed and keep going
+                params = futures[future]
+                result = {
+                    'run_id': params['run_id'],
+                    'status': 'error',
+                    'runtime': 0,
+                    'parameters': params,
+                    'error': f"worker process died: {e}"
+                }
+            results.append(result)
+            
+            # Save individual result as soon as the run finishes
+            with open(results_dir / f"run_{result['run_id']:02d}_result.json", 'w') as f:
+                json.dump(result, f, indent=2, default=str)
+    
+    results.sort(key=lambda r: r['run_id'])
     
     total_time = time.time() - start_time
     
@@ -244,23 +317,24 @@ def main():
         if len(successful) > 1:
             print(f"\n🔬 PARAMETER SENSITIVITY ANALYSIS:")
             
-            # Create DataFrame for analysis
-            df_results = pd.DataFrame(successful)
+            # Only runs whose final area could be read take part in the analysis
+            with_area = [r for r in successful if r.get('final_area_km2') is not None]
+            areas = np.array([r['final_area_km2'] for r in with_area], dtype=float)
             
-            if 'final_area_km2' in df_results.columns:
-                areas = df_results['final_area_km2'].dropna()
-                if len(areas) > 1 and areas.std() > 0:
-                    print(f"   📊 Final area range: {areas.min():.2f} - {areas.max():.2f} km²")
-                    print(f"   📈 Area variability: {areas.std():.2f} km² std dev")
-                    
-                    # Correlations with parameters
-                    for param in ['tbias', 'kp', 'ddfsnow']:
-                        param_values = [r['parameters'][param] for r in successful]
-                        if len(set(param_values)) > 1:  # Only if parameter varies
-                            correlation = np.corrcoef(param_values, areas)[0,1]
-                            print(f"   🔗 {param} correlation with final area: {correlation:.3f}")
-                else:
-                    print("   ⚠️ All runs produced similar results - may need wider parameter ranges")
+            if len(areas) > 1 and areas.std(ddof=1) > 0:
+                print(f"   📊 Final area range: {areas.min():.2f} - {areas.max():.2f} km²")
+                print(f"   📈 Area variability: {areas.std(ddof=1):.2f} km² std dev")
+                
+                # Correlations with parameters, from one correlation matrix over the varying ones
+                param_names = np.array(['tbias', 'kp', 'ddfsnow'])
+                param_values = np.array([[r['parameters'][p] for r in with_area] for p in param_names], dtype=float)
+                varies = np.ptp(param_values, axis=1) > 0
+                if varies.any():
+                    C = np.corrcoef(np.vstack([param_values[varies], areas]))
+                    for param, correlation in zip(param_names[varies], C[-1, :-1]):
+                        print(f"   🔗 {param} correlation with final area: {correlation:.3f}")
+            else:
+                print("   ⚠️ All runs produced similar results - may need wider parameter ranges")
     
     if failed:
         print(f"\n❌ FAILURE DETAILS:")
@@ -285,8 +359,7 @@ def main():
         })
         summary_data.append(row)
     
-    summary_df = pd.DataFrame(summary_data)
-    summary_df.to_csv(results_dir / "parameter_sweep_working_summary.csv", index=False)
+    write_csv(summary_data, results_dir / "parameter_sweep_working_summary.csv")
     
     # Save complete results
     with open(results_dir / "parameter_sweep_working_complete.json", 'w') as f:
@@ -314,5 +387,16 @@ def main():
     return results
 
 if __name__ == "__main__":
-    results = main()
+    parser = argparse.ArgumentParser(description="Working parameter sweep")
+    parser.add_argument('--workers', type=int, default=default_workers(),
+                        help="Number of simulations to run in parallel")
+    parser.add_argument('--in-process', action='store_true',
+                        help="Call PyGEM's run_simulation.main() inside the workers instead of "
+                             "spawning a new interpreter per run (no per-run timeout)")
+    parser.add_argument('--pygem-output-flag', default=None,
+                        help="run_simulation.py option that sets its output directory (e.g. -output_dir); "
+                             "when given, PyGEM writes straight into each run directory")
+    args = parser.parse_args()
+    
+    results = main(workers=args.workers, in_process=args.in_process, output_dir_flag=args.pygem_output_flag)
     print("\n🏁 Working parameter sweep completed!")
\ No newline at end of file
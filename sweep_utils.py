@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the parameter sweep scripts
+
+JSON I/O, worker counts, log tails, output linking and CSV summaries used by
+the sweep drivers and their analysis scripts.
+"""
+
+import os
+import csv
+import json
+import shutil
+import numpy as np
+from pathlib import Path
+
+# orjson parses and serializes (including NumPy scalars) in C; stdlib json otherwise
+try:
+    import orjson
+    loads = orjson.loads
+
+    def dumps(obj, indent=True):
+        """Serialize obj to JSON bytes, indented unless indent is False"""
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=str, option=option)
+except ImportError:
+    loads = json.loads
+
+    def dumps(obj, indent=True):
+        """Serialize obj to JSON bytes, indented unless indent is False"""
+        return json.dumps(obj, indent=2 if indent else None, default=str).encode()
+
+# netCDF4 is optional; read_nc_variables raises ImportError without it so callers can report that
+try:
+    import netCDF4 as nc
+    HAS_NC = True
+except ImportError:
+    HAS_NC = False
+
+# NetCDF files below this size are read into memory before opening
+NC_IN_MEMORY_MAX_BYTES = 128 * 1024 * 1024
+
+def dump_json(obj, path):
+    """Write obj to path as indented JSON"""
+    path.write_bytes(dumps(obj))
+
+def dump_jsonl(rows, path):
+    """Write rows to path as JSON lines, one compact object per line"""
+    path.write_bytes(b''.join(dumps(row, indent=False) + b'\n' for row in rows))
+
+def default_workers():
+    """Half the cores, leaving headroom for PyGEM's own threads"""
+    return max(1, (os.cpu_count() or 2) // 2)
+
+def read_tail(path, nbytes):
+    """Return the last nbytes of a log file without reading all of it"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - nbytes))
+        return f.read().decode(errors='replace')
+
+def link_or_copy(src, dst):
+    """Hardlink src to dst (no bytes copied), falling back to a copy across filesystems"""
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def list_run_outputs(directory, suffix):
+    """List the .nc files in directory whose name contains suffix, from a single scandir pass"""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    with os.scandir(directory) as it:
+        names = [e.name for e in it]
+    return [directory / n for n in names if n.endswith('.nc') and suffix in n[:-3]]
+
+def write_csv(rows, path):
+    """Write a list of dicts as CSV, columns in first-seen key order"""
+    fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in rows:
+            # csv writes floats via repr(), so unwrap NumPy scalars first
+            writer.writerow({k: v.item() if isinstance(v, np.generic) else v for k, v in row.items()})
+
+def read_nc_variables(path, names):
+    """Read whole variables from a NetCDF file, one unmasked read per variable
+    
+    Returns (arrays, n_variables); arrays maps each name to its array, or None if the
+    file lacks it. Small files are read in one call and parsed from memory, sparing
+    HDF5 its many small metadata reads.
+    """
+    if not HAS_NC:
+        raise ImportError("netCDF4 not available")
+    
+    if os.path.getsize(path) < NC_IN_MEMORY_MAX_BYTES:
+        ds = nc.Dataset(os.path.basename(path), 'r', memory=Path(path).read_bytes())
+    else:
+        ds = nc.Dataset(path, 'r')
+    
+    with ds:
+        ds.set_auto_mask(False)
+        ds.set_auto_scale(False)
+        variables = ds.variables
+        arrays = {}
+        for name in names:
+            var = variables.get(name)
+            arrays[name] = var[:] if var is not None else None
+        return arrays, len(variables)
@@ -12,11 +12,14 @@ Should produce different final areas if fix is working correctly.
 
 import os
 import sys
+import argparse
 import subprocess
 import time
-import json
+import numpy as np
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from sweep_utils import dump_json, dump_jsonl, read_tail, read_nc_variables
 
 def run_parameter_test(test_id, tbias, kp, ddfsnow):
     """Run single test with specific parameters"""
@@ -49,28 +52,24 @@ def run_parameter_test(test_id, tbias, kp, ddfsnow):
     start_time = time.time()
     
     try:
-        result = subprocess.run(
-            cmd,
-            cwd="/Users/kaimyers/PygemRound2",
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
+        # Stream stdout/stderr straight to the logs instead of buffering them in memory
+        with open(run_dir / 'stdout.log', 'wb') as out, open(run_dir / 'stderr.log', 'wb') as err:
+            result = subprocess.run(
+                cmd,
+                cwd="/Users/kaimyers/PygemRound2",
+                stdout=out,
+                stderr=err,
+                timeout=300  # 5 minute timeout
+            )
         
         runtime = time.time() - start_time
         
-        # Save logs
-        with open(run_dir / 'stdout.log', 'w') as f:
-            f.write(result.stdout)
-        with open(run_dir / 'stderr.log', 'w') as f:
-            f.write(result.stderr)
-        
         if result.returncode == 0:
             print(f"✅ Test {test_id} SUCCESS in {runtime:.1f}s")
             
             # Check for output files and analyze
             output_base = Path("/Users/kaimyers/PygemRound2/data/Output/simulations/01/ACCESS-CM2/ssp245")
-            stats_files = list((output_base / "stats").glob(f"*_fixtest{test_id}*.nc")) if (output_base / "stats").exists() else []
+            stats_files = list((output_base / "stats").glob(f"*_fixtest{test_id}*.nc"))  # empty if the directory is missing
             
             final_area = None
             initial_area = None
@@ -78,21 +77,22 @@ def run_parameter_test(test_id, tbias, kp, ddfsnow):
             
             if stats_files:
                 try:
-                    import netCDF4 as nc
-                    with nc.Dataset(stats_files[0], 'r') as ds:
-                        if 'glac_area_annual' in ds.variables:
-                            area_data = ds.variables['glac_area_annual'][0, :] / 1e6  # Convert to km²
-                            initial_area = area_data[0] if area_data[0] > 0 else area_data[1]
-                            final_area = area_data[-1]
-                            area_loss_pct = (initial_area - final_area) / initial_area * 100
-                            
-                            print(f"   🏔️ Area: {initial_area:.2f} → {final_area:.2f} km² ({area_loss_pct:.1f}% loss)")
+                    arrays, _ = read_nc_variables(stats_files[0], ('glac_area_annual', 'glac_massbaltotal_annual'))
+                    area = arrays['glac_area_annual']
+                    mb = arrays['glac_massbaltotal_annual']
+                    
+                    if area is not None:
+                        area_data = area[0] / 1e6  # Convert to km²
+                        initial_area = area_data[0] if area_data[0] > 0 else area_data[1]
+                        final_area = area_data[-1]
+                        area_loss_pct = (initial_area - final_area) / initial_area * 100
+                        
+                        print(f"   🏔️ Area: {initial_area:.2f} → {final_area:.2f} km² ({area_loss_pct:.1f}% loss)")
+                    
+                    if mb is not None:
+                        mass_balance = mb[0].sum() / initial_area / 1e6  # Convert to m w.e.
+                        print(f"   ⚖️ Total mass balance: {mass_balance:.2f} m w.e.")
                         
-                        if 'glac_massbaltotal_annual' in ds.variables:
-                            mb_data = ds.variables['glac_massbaltotal_annual'][0, :]
-                            mass_balance = mb_data.sum() / initial_area / 1e6  # Convert to m w.e.
-                            print(f"   ⚖️ Total mass balance: {mass_balance:.2f} m w.e.")
-                            
                 except Exception as e:
                     print(f"   ⚠️ Data analysis error: {e}")
             
@@ -108,15 +108,16 @@ def run_parameter_test(test_id, tbias, kp, ddfsnow):
             }
         
         else:
+            stderr_tail = read_tail(run_dir / 'stderr.log', 500)
             print(f"❌ Test {test_id} FAILED (code {result.returncode}) after {runtime:.1f}s")
-            print(f"Error: {result.stderr[-200:]}")
+            print(f"Error: {stderr_tail[-200:]}")
             
             return {
                 'test_id': test_id,
                 'status': 'failed',
                 'runtime': runtime,
                 'parameters': {'tbias': tbias, 'kp': kp, 'ddfsnow': ddfsnow},
-                'error': result.stderr[-500:]
+                'error': stderr_tail
             }
     
     except Exception as e:
@@ -128,7 +129,7 @@ def run_parameter_test(test_id, tbias, kp, ddfsnow):
             'error': str(e)
         }
 
-def main():
+def main(keep_individual=False):
     """Test parameter fix with 3 different combinations"""
     print("🔧 TESTING PARAMETER FIX")
     print("=" * 50)
@@ -142,18 +143,24 @@ def main():
     ]
     
     results = []
+    results_dir = Path("/Users/kaimyers/PygemRound2/parameter_fix_test")
     
-    for test_id, tbias, kp, ddfsnow in test_cases:
-        result = run_parameter_test(test_id, tbias, kp, ddfsnow)
-        results.append(result)
-        
-        # Save individual result
-        results_dir = Path("/Users/kaimyers/PygemRound2/parameter_fix_test")
-        with open(results_dir / f"test_{test_id}_result.json", 'w') as f:
-            json.dump(result, f, indent=2, default=str)
-        
-        # Brief pause between tests
-        time.sleep(3)
+    # Each test only blocks on its own PyGEM subprocess and writes its own files, so run them all at once
+    with ThreadPoolExecutor(max_workers=len(test_cases)) as ex:
+        futures = [ex.submit(run_parameter_test, *test_case) for test_case in test_cases]
+        for future in as_completed(futures):
+            results.append(future.result())
+    
+    results.sort(key=lambda r: r['test_id'])
+    
+    # Save all results in one pass, before any analysis can fail: the summary plus
+    # a JSON-lines copy for analyze_parameter_sweep_success.py
+    dump_json(results, results_dir / "parameter_fix_test_summary.json")
+    dump_jsonl(results, results_dir / "all_results.jsonl")
+    
+    if keep_individual:
+        for result in results:
+            dump_json(result, results_dir / f"test_{result['test_id']}_result.json")
     
     # Analysis
     print("\n" + "=" * 50)
@@ -169,7 +176,7 @@ def main():
         final_areas = [r['final_area_km2'] for r in successful if r['final_area_km2'] is not None]
         mass_balances = [r['mass_balance_mwe'] for r in successful if r['mass_balance_mwe'] is not None]
         
-        if len(set([round(a, 3) for a in final_areas])) > 1:
+        if np.unique(np.round(np.asarray(final_areas, dtype=np.float64), 3)).size > 1:
             print("🎉 SUCCESS: Different parameters produce different results!")
             print("✅ Parameter fix is working correctly")
             
@@ -203,15 +210,15 @@ def main():
         for result in failed:
             print(f"   Test {result['test_id']}: {result.get('status', 'unknown error')}")
     
-    # Save summary
-    results_dir = Path("/Users/kaimyers/PygemRound2/parameter_fix_test")
-    with open(results_dir / "parameter_fix_test_summary.json", 'w') as f:
-        json.dump(results, f, indent=2, default=str)
-    
     print(f"\n💾 Results saved to: {results_dir}")
     
     return results
 
 if __name__ == "__main__":
-    results = main()
+    parser = argparse.ArgumentParser(description="Verify different parameters produce different results")
+    parser.add_argument('--keep-individual', action='store_true',
+                        help="Also write a test_<id>_result.json file per test")
+    args = parser.parse_args()
+    
+    results = main(keep_individual=args.keep_individual)
     print("\n🏁 Parameter fix test completed!")
\ No newline at end of file
@@ -10,13 +10,123 @@ Analyzes existing parameter sweep results to validate:
 """
 
 import os
+import csv
 import json
-import pandas as pd
+import bisect
+import argparse
 import numpy as np
 from pathlib import Path
+from sweep_utils import read_nc_variables
 
-def analyze_existing_results():
-    """Analyze existing parameter sweep results"""
+# joblib's loky worker processes read many runs' files side by side; without it, analyze serially
+# (netCDF4/HDF5 are not thread-safe, so threads are not an option)
+try:
+    from joblib import Parallel, delayed
+except ImportError:
+    Parallel = None
+
+def _summarize_stats_file(path):
+    """Reduce a stats file to the scalar metrics the report needs (None where a variable is missing)"""
+    data, n_variables = read_nc_variables(path, ('glac_area_annual', 'glac_runoff_monthly'))
+    metrics = {
+        'n_variables': n_variables,
+        'initial_area': None,
+        'final_area': None,
+        'area_loss_pct': None,
+        'max_discharge': None
+    }
+    
+    if data['glac_area_annual'] is not None:
+        area_data = data['glac_area_annual'][0] / 1e6  # Convert to km²
+        initial_area = area_data[0] if area_data[0] > 0 else area_data[1]
+        final_area = area_data[-1]
+        metrics['initial_area'] = float(initial_area)
+        metrics['final_area'] = float(final_area)
+        metrics['area_loss_pct'] = float((initial_area - final_area) / initial_area * 100)
+    
+    if data['glac_runoff_monthly'] is not None:
+        metrics['max_discharge'] = float(np.max(data['glac_runoff_monthly'][0]))
+    
+    return metrics
+
+def _load_cached_metrics(run_dir, nc_path):
+    """Return a stats file's metrics, reusing run_dir's cache while the file's mtime and size are unchanged"""
+    st = os.stat(nc_path)
+    key = {'file': os.path.basename(nc_path), 'mtime': st.st_mtime_ns, 'size': st.st_size}
+    cache_file = Path(run_dir) / "_analysis_cache.json"
+    
+    try:
+        with open(cache_file, 'r') as f:
+            cached = json.load(f)
+        if all(cached.get(k) == v for k, v in key.items()):
+            return cached['metrics']
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    metrics = _summarize_stats_file(nc_path)
+    try:
+        with open(cache_file, 'w') as f:
+            json.dump({**key, 'metrics': metrics}, f)
+    except OSError:
+        pass
+    return metrics
+
+def _analyze_one_run(run_id, run_dir, nc_files, stats_files, params):
+    """Analyze one successful run's outputs, returning its report lines, run_data entry and any error"""
+    lines = [
+        f"\n   Run {run_id:04d}:",
+        f"      📁 Directory: {run_dir}",
+        f"      📄 Output files: {len(nc_files)}"
+    ]
+    record = None
+    error = None
+    
+    # Get parameter information
+    if params is not None:
+        lines.append(f"      🔧 Parameters: tbias={params['tbias']}, kp={params['kp']}, ddf={params['ddfsnow']}")
+        
+        # Try to analyze the output data
+        try:
+            # Main stats file, picked out during the directory scan
+            if stats_files:
+                metrics = _load_cached_metrics(run_dir, stats_files[0])
+                
+                # Check available variables
+                lines.append(f"      📋 Variables: {metrics['n_variables']} available")
+                
+                # Get glacier area data if available
+                if metrics['initial_area'] is not None:
+                    lines.append(f"      🏔️ Initial area: {metrics['initial_area']:.2f} km²")
+                    lines.append(f"      🏔️ Final area: {metrics['final_area']:.2f} km²")
+                    lines.append(f"      📉 Area loss: {metrics['area_loss_pct']:.1f}%")
+                    
+                    record = {
+                        'run_id': run_id,
+                        'tbias': params['tbias'],
+                        'kp': params['kp'],
+                        'ddfsnow': params['ddfsnow'],
+                        'initial_area': metrics['initial_area'],
+                        'final_area': metrics['final_area'],
+                        'area_loss_pct': metrics['area_loss_pct'],
+                        'output_files': len(nc_files)
+                    }
+                
+                # Get discharge data if available
+                if metrics['max_discharge'] is not None:
+                    lines.append(f"      💧 Max discharge: {metrics['max_discharge']:.2e} m³/s")
+                    
+        except ImportError:
+            error = "netCDF4 not available for data analysis"
+        except Exception as e:
+            error = f"Data analysis error: {e}"
+    
+    return {'lines': lines, 'run_data': record, 'error': error}
+
+def analyze_existing_results(verbose=False):
+    """Analyze existing parameter sweep results
+    
+    Per-run details are only printed when verbose is set; summaries and per-run errors always print.
+    """
     
     print("🔍 PARAMETER SWEEP VALIDATION ANALYSIS")
     print("=" * 60)
@@ -29,25 +139,47 @@ def analyze_existing_results():
         return
     
     # Find successful runs (those with .nc files)
+    # Failed runs are only counted, keeping a few as samples for the failure report
     successful_runs = []
-    failed_runs = []
+    n_failed = 0
+    failed_sample = []
     
-    for run_dir in sorted(results_dir.glob("run_*")):
-        run_id = int(run_dir.name.split('_')[1])
-        
-        # Check for NetCDF output files
-        nc_files = list(run_dir.glob("*.nc"))
-        
-        if nc_files:
-            successful_runs.append((run_id, run_dir, nc_files))
-        else:
-            failed_runs.append((run_id, run_dir))
+    # scandir hands back names and cached entry types, so no Path objects or extra stat() per entry
+    # The scan runs in directory order; only the small report lists get sorted by run_id
+    with os.scandir(results_dir) as it:
+        for entry in it:
+            if not (entry.name.startswith('run_') and entry.is_dir(follow_symlinks=False)):
+                continue
+            run_id = int(entry.name.split('_', 1)[1])
+            run_dir = entry.path
+            
+            # Check for NetCDF output files, noting the main stats files in the same pass
+            nc_files = []
+            stats_files = []
+            with os.scandir(run_dir) as files:
+                for f in files:
+                    if f.name.endswith('.nc'):
+                        nc_files.append(f.path)
+                        if f.name.endswith('all.nc'):
+                            stats_files.append(f.path)
+            
+            if nc_files:
+                successful_runs.append((run_id, run_dir, nc_files, stats_files))
+            else:
+                # Keep the three lowest-numbered failures as samples
+                n_failed += 1
+                bisect.insort(failed_sample, (run_id, run_dir))
+                del failed_sample[3:]
+    
+    successful_runs.sort(key=lambda run: run[0])
+    
+    total_runs = len(successful_runs) + n_failed
     
     print(f"📊 SUMMARY:")
-    print(f"   Total run directories: {len(list(results_dir.glob('run_*')))}")
+    print(f"   Total run directories: {total_runs}")
     print(f"   ✅ Successful runs: {len(successful_runs)}")
-    print(f"   ❌ Failed runs: {len(failed_runs)}")
-    print(f"   Success rate: {len(successful_runs)/(len(successful_runs)+len(failed_runs))*100:.1f}%")
+    print(f"   ❌ Failed runs: {n_failed}")
+    print(f"   Success rate: {len(successful_runs)/total_runs*100:.1f}%")
     
     if not successful_runs:
         print("❌ No successful runs found - parameter sweep framework has issues")
@@ -57,87 +189,62 @@ def analyze_existing_results():
     
     # Load parameter information
     try:
-        df = pd.read_csv("/Users/kaimyers/PygemRound2/parameter_sweep/parameter_sweep_summary.csv")
-        print(f"   Parameters file loaded: {len(df)} parameter combinations")
-    except:
+        # Three columns indexed by row don't need pandas; csv handles quoted fields such as error messages
+        cols = {p: [] for p in ('tbias', 'kp', 'ddfsnow')}
+        with open("/Users/kaimyers/PygemRound2/parameter_sweep/parameter_sweep_summary.csv", newline='') as f:
+            for row in csv.DictReader(f):
+                for p, column in cols.items():
+                    column.append(float(row[p]))
+        n_params = len(cols['tbias'])
+        print(f"   Parameters file loaded: {n_params} parameter combinations")
+    except (OSError, ValueError, KeyError):
         print("   ⚠️ Could not load parameter summary file")
-        df = None
+        cols = None
     
-    # Analyze each successful run
-    run_data = []
+    # Analyze each successful run; workers return their report lines so output stays in run order
+    jobs = [(run_id, run_dir, nc_files, stats_files,
+             {p: cols[p][run_id] for p in ('tbias', 'kp', 'ddfsnow')}
+             if cols is not None and run_id < n_params else None)
+            for run_id, run_dir, nc_files, stats_files in successful_runs]
+    if Parallel is not None:
+        analyses = Parallel(n_jobs=-1, backend='loky')(delayed(_analyze_one_run)(*job) for job in jobs)
+    else:
+        analyses = [_analyze_one_run(*job) for job in jobs]
     
-    for run_id, run_dir, nc_files in successful_runs:
-        print(f"\n   Run {run_id:04d}:")
-        print(f"      📁 Directory: {run_dir}")
-        print(f"      📄 Output files: {len(nc_files)}")
-        
-        # Get parameter information
-        if df is not None and run_id < len(df):
-            params = df.iloc[run_id]
-            print(f"      🔧 Parameters: tbias={params['tbias']}, kp={params['kp']}, ddf={params['ddfsnow']}")
-            
-            # Try to analyze the output data
-            try:
-                import netCDF4 as nc
-                
-                # Find the main stats file
-                stats_files = [f for f in nc_files if 'all.nc' in f.name]
-                if stats_files:
-                    with nc.Dataset(stats_files[0], 'r') as ds:
-                        # Check available variables
-                        variables = list(ds.variables.keys())
-                        print(f"      📋 Variables: {len(variables)} available")
-                        
-                        # Get glacier area data if available
-                        if 'glac_area_annual' in ds.variables:
-                            area_data = ds.variables['glac_area_annual'][0, :] / 1e6  # Convert to km²
-                            initial_area = area_data[0] if area_data[0] > 0 else area_data[1]
-                            final_area = area_data[-1]
-                            area_loss_pct = (initial_area - final_area) / initial_area * 100
-                            
-                            print(f"      🏔️ Initial area: {initial_area:.2f} km²")
-                            print(f"      🏔️ Final area: {final_area:.2f} km²")
-                            print(f"      📉 Area loss: {area_loss_pct:.1f}%")
-                            
-                            run_data.append({
-                                'run_id': run_id,
-                                'tbias': params['tbias'],
-                                'kp': params['kp'],
-                                'ddfsnow': params['ddfsnow'],
-                                'initial_area': initial_area,
-                                'final_area': final_area,
-                                'area_loss_pct': area_loss_pct,
-                                'output_files': len(nc_files)
-                            })
-                        
-                        # Get discharge data if available
-                        if 'glac_runoff_monthly' in ds.variables:
-                            discharge_data = ds.variables['glac_runoff_monthly'][0, :]
-                            max_discharge = np.max(discharge_data)
-                            print(f"      💧 Max discharge: {max_discharge:.2e} m³/s")
-                            
-            except ImportError:
-                print("      ⚠️ netCDF4 not available for data analysis")
-            except Exception as e:
-                print(f"      ⚠️ Data analysis error: {e}")
+    # Collect per-run records column-wise, ready to wrap as arrays
+    run_data = {k: [] for k in ('run_id', 'tbias', 'kp', 'ddfsnow', 'initial_area',
+                                'final_area', 'area_loss_pct', 'output_files')}
+    for analysis in analyses:
+        if verbose:
+            print('\n'.join(analysis['lines']))
+        if analysis['error'] is not None:
+            if not verbose:
+                print(analysis['lines'][0])
+            print(f"      ⚠️ {analysis['error']}")
+        record = analysis['run_data']
+        if record is not None:
+            for k, column in run_data.items():
+                column.append(record[k])
     
     # Compare results across different parameters
-    if len(run_data) > 1:
+    if len(run_data['run_id']) > 1:
         print(f"\n🔬 PARAMETER SENSITIVITY ANALYSIS:")
         
-        run_df = pd.DataFrame(run_data)
+        run_arrays = {k: np.asarray(v, dtype=np.float64) for k, v in run_data.items()}
+        final_area_arr = run_arrays['final_area']
         
         # Check if different parameters produce different results
-        if len(run_df['final_area'].unique()) > 1:
+        if np.unique(np.round(final_area_arr, 3)).size > 1:
             print("   ✅ Parameter variations produce different results")
-            print(f"   📊 Final area range: {run_df['final_area'].min():.2f} - {run_df['final_area'].max():.2f} km²")
-            print(f"   📊 Area loss range: {run_df['area_loss_pct'].min():.1f}% - {run_df['area_loss_pct'].max():.1f}%")
+            area_loss_arr = run_arrays['area_loss_pct']
+            print(f"   📊 Final area range: {np.nanmin(final_area_arr):.2f} - {np.nanmax(final_area_arr):.2f} km²")
+            print(f"   📊 Area loss range: {np.nanmin(area_loss_arr):.1f}% - {np.nanmax(area_loss_arr):.1f}%")
             
             # Show parameter correlations
-            if 'tbias' in run_df.columns:
-                tbias_range = run_df['tbias'].max() - run_df['tbias'].min()
-                kp_range = run_df['kp'].max() - run_df['kp'].min()
-                ddf_range = run_df['ddfsnow'].max() - run_df['ddfsnow'].min()
+            if 'tbias' in run_arrays:
+                tbias_range = np.nanmax(run_arrays['tbias']) - np.nanmin(run_arrays['tbias'])
+                kp_range = np.nanmax(run_arrays['kp']) - np.nanmin(run_arrays['kp'])
+                ddf_range = np.nanmax(run_arrays['ddfsnow']) - np.nanmin(run_arrays['ddfsnow'])
                 
                 print(f"   🔧 Parameter ranges tested:")
                 print(f"      tbias: {tbias_range:.1f}°C range")
@@ -147,35 +254,34 @@ def analyze_existing_results():
             print("   ⚠️ All runs produced identical results - may indicate parameter range too narrow")
     
     # Check failure analysis
-    if failed_runs:
+    if n_failed:
         print(f"\n❌ FAILURE ANALYSIS:")
-        print(f"   {len(failed_runs)} runs failed")
+        print(f"   {n_failed} runs failed")
         
         # Sample a few failed runs to understand issues
-        sample_failed = failed_runs[:3]
-        for run_id, run_dir in sample_failed:
+        for run_id, run_dir in failed_sample:
             print(f"   Run {run_id:04d}:")
             
-            # Check for run_info.json
-            run_info_file = run_dir / "run_info.json"
-            if run_info_file.exists():
-                try:
-                    with open(run_info_file, 'r') as f:
-                        run_info = json.load(f)
+            # Check for run_info.json; a missing file just means there is nothing to report
+            try:
+                with open(os.path.join(run_dir, "run_info.json"), 'r') as f:
+                    run_info = json.load(f)
+                
+                status = run_info.get('status', 'unknown')
+                error = run_info.get('error_msg', 'No error message')
+                print(f"      Status: {status}")
+                if 'error' in error.lower() or 'fail' in error.lower():
+                    print(f"      Error: {error[:100]}...")
                     
-                    status = run_info.get('status', 'unknown')
-                    error = run_info.get('error_msg', 'No error message')
-                    print(f"      Status: {status}")
-                    if 'error' in error.lower() or 'fail' in error.lower():
-                        print(f"      Error: {error[:100]}...")
-                        
-                except Exception as e:
-                    print(f"      Could not read run info: {e}")
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"      Could not read run info: {e}")
     
     # Overall assessment
     print(f"\n🎯 PARAMETER SWEEP FRAMEWORK ASSESSMENT:")
     
-    success_rate = len(successful_runs)/(len(successful_runs)+len(failed_runs))
+    success_rate = len(successful_runs)/total_runs
     
     if success_rate >= 0.8:
         print("   🎉 EXCELLENT! Parameter sweep framework is working well")
@@ -198,7 +304,7 @@ def analyze_existing_results():
         print("   ✅ PyGEM simulations can run with parameter variations")
         print("   ✅ Output files are generated and contain real data")
     
-    if len(failed_runs) > len(successful_runs):
+    if n_failed > len(successful_runs):
         print("   🔧 Fix config file management issues")
         print("   🔧 Improve error handling and recovery")
         print("   🔧 Add parameter validation")
@@ -208,13 +314,18 @@ def analyze_existing_results():
     print("   📋 Add output validation checks")
     
     return {
-        'total_runs': len(successful_runs) + len(failed_runs),
+        'total_runs': total_runs,
         'successful_runs': len(successful_runs),
-        'failed_runs': len(failed_runs),
+        'failed_runs': n_failed,
         'success_rate': success_rate,
         'run_data': run_data
     }
 
 if __name__ == "__main__":
-    results = analyze_existing_results()
+    parser = argparse.ArgumentParser(description="Validate existing parameter sweep results")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="Report details for every successful run")
+    args = parser.parse_args()
+    
+    results = analyze_existing_results(verbose=args.verbose)
     print("\n🏁 Parameter sweep validation completed!")
\ No newline at end of file